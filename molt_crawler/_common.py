@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Shared paths and loaders for the crawler scripts.
+
+verify_sites.py and discover.py both need the portal/exclusion domain
+sets and the unverified-site listing. Keeping one implementation here
+also means listing-only invocations import nothing heavier than the
+stdlib - no aiohttp/anthropic just to read JSON.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+# File paths
+CRAWLER_DB = Path(__file__).parent / "molt_sites_db.json"
+PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
+EXCLUDED_JSON = Path(__file__).parent / "excluded_sites.json"
+
+# Memoized JSON reads: the listing path hits portals.json /
+# excluded_sites.json / the verdict cache several times per run, so
+# parses are cached keyed by mtime and served from memory while the
+# file on disk is unchanged.
+_json_cache = {}
+
+
+def _load_json(path: Path):
+    """Parse a JSON file, reusing the cached parse while its mtime holds."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    with open(path) as f:
+        data = json.load(f)
+    _json_cache[path] = (mtime_ns, data)
+    return data
+
+
+@lru_cache(maxsize=4096)
+def normalize_domain(url: str) -> str:
+    """Lowercased netloc with the leading www. stripped.
+
+    Memoized - the same URLs come up across portals, the crawler DB
+    and verdicts within one run, and urlparse isn't cheap.
+    """
+    if not url.startswith('http'):
+        url = f'https://{url}'
+    return urlparse(url).netloc.lower().removeprefix('www.')
+
+
+@lru_cache(maxsize=4096)
+def normalize_url_key(url: str) -> str:
+    """Dedup key for a portal URL: domain plus path, no trailing slash."""
+    parsed = urlparse(url.lower())
+    return f"{parsed.netloc.removeprefix('www.')}{parsed.path.rstrip('/')}"
+
+
+def load_excluded() -> set:
+    """Load excluded domains."""
+    data = _load_json(EXCLUDED_JSON)
+    if data is None:
+        return set()
+    return set(data.get('excluded', {}).keys())
+
+
+# Derived portal-domain set, cached alongside the parse so repeat calls
+# don't re-run urlparse over every portal
+_portal_domains = (None, frozenset())
+
+
+def load_portals() -> frozenset:
+    """Load existing portal domains."""
+    global _portal_domains
+    data = _load_json(PORTALS_JSON)
+    if data is None:
+        return frozenset()
+    mtime_ns = _json_cache[PORTALS_JSON][0]
+    if _portal_domains[0] != mtime_ns:
+        _portal_domains = (mtime_ns, frozenset(
+            normalize_domain(p.get('url', '')) for p in data.get('portals', [])))
+    return _portal_domains[1]
+
+
+def get_unverified_sites(limit: int = 20) -> list:
+    """Get sites from crawler DB that aren't in portals or exclusions."""
+    if not CRAWLER_DB.exists():
+        return []
+
+    with open(CRAWLER_DB) as f:
+        db = json.load(f)
+
+    sites = db.get('sites', {})
+    # One union set = one hash probe per candidate below
+    already_processed = load_portals() | load_excluded()
+
+    unverified = []
+    for url, info in sites.items():
+        # crawler.py records content presence as has_content
+        if not info.get('alive') or not info.get('has_content'):
+            continue
+
+        domain = normalize_domain(url)
+
+        # Skip if already processed
+        if domain in already_processed:
+            continue
+
+        unverified.append({
+            'url': info.get('url', f'https://{domain}'),
+            'domain': domain,
+            'title': info.get('title', '')
+        })
+
+        if len(unverified) >= limit:
+            break
+
+    return unverified
@@ -8,6 +8,8 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+from portals_store import atomic_write_json
+
 PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
 
 # TLD preference order (higher = better)
@@ -189,8 +191,7 @@ def dedupe(dry_run=True):
     remove_urls = {p['url'] for p in to_remove}
     data['portals'] = [p for p in data['portals'] if p['url'] not in remove_urls]
 
-    with open(PORTALS_JSON, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    atomic_write_json(PORTALS_JSON, data)
 
     print(f"✅ Removed {len(to_remove)} duplicates")
     print(f"📁 Remaining: {len(data['portals'])} portals")
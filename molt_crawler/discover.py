@@ -13,43 +13,47 @@ Usage:
   python3 discover.py --dedup      # Check for duplicates in portals.json
 """
 
-import asyncio
+import io
 import sys
-import json
 from pathlib import Path
-from urllib.parse import urlparse
-from collections import Counter
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from crawler import Database, Crawler, SEED_URLS
 from sync_portals import sync
+from portals_store import PortalsStore, canonicalize_url
+
+# crawler (aiohttp, bs4, certifi) and asyncio are imported lazily in
+# run_crawler so ops-style subcommands like --sync/--dedup start fast
 
 PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
 
 
-async def run_crawler(fast_mode: bool = False):
-    """Run the crawler."""
-    db = Database()
-    crawler = Crawler(db)
-    await crawler.run()
-    return len(crawler.discoveries)
+def run_crawler(fast_mode: bool = False):
+    """Run the crawler (imports the heavy crawl stack on demand)."""
+    import asyncio
+    from crawler import Database, Crawler
+
+    async def _run():
+        db = Database()
+        crawler = Crawler(db)
+        await crawler.run()
+        return len(crawler.discoveries)
+
+    return asyncio.run(_run())
 
 
-def check_duplicates() -> list:
+def check_duplicates(store: PortalsStore = None) -> list:
     """Check for duplicate URLs in portals.json."""
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
+    if store is None:
+        store = PortalsStore(PORTALS_JSON)
+    data = store.load()
 
     # Normalize URLs for comparison
     url_to_portals = {}
     for p in data['portals']:
-        url = p.get('url', '')
-        # Normalize: lowercase, remove www, remove trailing slash
-        normalized = urlparse(url.lower())
-        domain = normalized.netloc.replace('www.', '')
-        key = f"{domain}{normalized.path.rstrip('/')}"
+        # Canonical key: lowercase, no scheme, no www, no trailing slash
+        key = canonicalize_url(p.get('url', ''))
 
         if key not in url_to_portals:
             url_to_portals[key] = []
@@ -69,7 +73,8 @@ def check_duplicates() -> list:
 
 def remove_duplicates(dry_run: bool = True) -> int:
     """Remove duplicate entries, keeping the first (usually better curated) one."""
-    duplicates = check_duplicates()
+    store = PortalsStore(PORTALS_JSON)
+    duplicates = check_duplicates(store)
 
     if not duplicates:
         print("✅ No duplicates found")
@@ -77,22 +82,24 @@ def remove_duplicates(dry_run: bool = True) -> int:
 
     print(f"🔍 Found {len(duplicates)} duplicate URL groups:\n")
 
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
+    data = store.load()
 
-    to_remove = []
+    # Set so the removal filter below is O(1) per portal, not O(len(to_remove))
+    to_remove = set()
+    buf = io.StringIO()  # batch per-group lines into one write
     for dup in duplicates:
         portals = dup['portals']
         # Keep first one (usually the original, better-curated entry)
         keep = portals[0]
         remove = portals[1:]
 
-        print(f"  {dup['key']}:")
-        print(f"    ✓ Keep: {keep['id']} ({keep.get('name', 'Unknown')})")
+        print(f"  {dup['key']}:", file=buf)
+        print(f"    ✓ Keep: {keep['id']} ({keep.get('name', 'Unknown')})", file=buf)
         for r in remove:
-            print(f"    ✗ Remove: {r['id']} ({r.get('name', 'Unknown')})")
-            to_remove.append(r['id'])
-        print()
+            print(f"    ✗ Remove: {r['id']} ({r.get('name', 'Unknown')})", file=buf)
+            to_remove.add(r['id'])
+        print(file=buf)
+    sys.stdout.write(buf.getvalue())
 
     if dry_run:
         print(f"Run with --dedup --apply to remove {len(to_remove)} duplicates")
@@ -101,16 +108,36 @@ def remove_duplicates(dry_run: bool = True) -> int:
     # Actually remove
     data['portals'] = [p for p in data['portals'] if p['id'] not in to_remove]
 
-    with open(PORTALS_JSON, 'w') as f:
-        json.dump(data, f, indent=2)
+    store.mark_dirty()
+    store.flush()
 
     print(f"✅ Removed {len(to_remove)} duplicate entries")
     return len(to_remove)
 
 
+def run_verification(limit: int = 20, apply: bool = False):
+    """Fetch + LLM-verify unverified sites via the bounded concurrent pool.
+
+    Falls back to just listing them when no API key is configured.
+    """
+    import os
+    if not os.environ.get('ANTHROPIC_API_KEY'):
+        show_unverified(limit)
+        return
+
+    from _common import get_unverified_sites
+    from verify_sites import run_verification as verify
+    sites = get_unverified_sites(limit)
+    if not sites:
+        print("No unverified sites to check")
+        return
+    verify(sites, apply=apply)
+
+
 def show_unverified(limit: int = 10):
     """Show unverified sites that need manual review in Claude Code."""
-    from verify_sites import get_unverified_sites
+    # _common is stdlib-only - listing doesn't pull in the fetch stack
+    from _common import get_unverified_sites
 
     sites = get_unverified_sites(limit)
     if not sites:
@@ -148,30 +175,56 @@ def main():
     print("🦞 MOLT DISCOVERY PIPELINE")
     print("=" * 50)
 
+    # One shared store - every step below works on the same parsed copy
+    # of portals.json, flushed to disk once at the end
+    store = PortalsStore(PORTALS_JSON)
+
     # Step 1: Run crawler
     print("\n📡 STEP 1: CRAWLING FOR NEW SITES")
     print("-" * 40)
-    new_sites = asyncio.run(run_crawler(fast_mode=fast))
+    new_sites = run_crawler(fast_mode=fast)
 
     # Step 2: Sync to portals.json
     print("\n📋 STEP 2: SYNCING TO PORTALS.JSON")
     print("-" * 40)
-    sync()
+    sync(store)
 
-    # Step 3: Check duplicates
-    print("\n🔍 STEP 3: CHECKING FOR DUPLICATES")
+    # Step 3: Duplicate check + quality scoring. The duplicate check is
+    # read-only and the scoring pass is pure, so they overlap in threads;
+    # results are applied to the store afterwards.
+    print("\n🔍 STEP 3: DUPLICATES + QUALITY SCORING")
     print("-" * 40)
-    duplicates = check_duplicates()
+    import asyncio
+    from quality import compute_quality_updates, apply_quality_updates, mark_featured
+
+    async def post_process():
+        return await asyncio.gather(
+            asyncio.to_thread(check_duplicates, store),
+            asyncio.to_thread(compute_quality_updates, store.load()['portals']),
+        )
+
+    duplicates, updates = asyncio.run(post_process())
+
     if duplicates:
         print(f"⚠️  Found {len(duplicates)} duplicate groups. Run --dedup to review.")
     else:
         print("✅ No duplicates")
 
-    # Step 4: Show unverified sites
+    if apply_quality_updates(store.load()['portals'], updates):
+        store.mark_dirty()
+    print(f"📊 Updated scores on {len(updates)} portals")
+    mark_featured(store)
+
+    # Flush before verification: verify_sites reads and rewrites
+    # portals.json on disk, so the store's in-memory copy must land
+    # first (and must not clobber the verifier's writes afterwards)
+    store.flush()
+
+    # Step 4: Verify new sites with the LLM (or list them without a key)
     if verify:
-        print("\n🔍 STEP 4: SITES NEEDING VERIFICATION")
+        print("\n🔍 STEP 4: SITE VERIFICATION")
         print("-" * 40)
-        show_unverified()
+        run_verification(apply='--apply' in args)
 
     print("\n" + "=" * 50)
     print("✅ DISCOVERY COMPLETE")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Shared in-memory store for portals.json.
+
+The discovery pipeline used to parse and rewrite portals.json once per
+step (sync, duplicate check, quality scoring, featured marking) - four
+full parse/serialize cycles on the same data in one run. PortalsStore
+keeps one parsed copy in memory, keyed by file mtime so a stale copy is
+never served, and flushes to disk once at the end of the pipeline.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+# Optional C-extension JSON codec - 3-5x faster than stdlib json on
+# dict payloads this shape. Falls back to stdlib.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
+
+
+def dumps_json(data) -> bytes:
+    """Serialize to pretty-printed UTF-8 bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(raw: bytes):
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def atomic_write_json(path: Path, data):
+    """Write JSON durably: temp sibling, flush + fsync, then os.replace,
+    so a crash or a concurrent reader never sees a truncated file."""
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(dumps_json(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=100_000)
+def canonicalize_url(url: str) -> str:
+    """Canonical key for a portal URL: lowercase, no scheme, no www.,
+    no trailing slash.
+
+    Memoized - dedup, sync and scoring all touch the same URLs within
+    one pipeline run, and this avoids a urlparse per call.
+    """
+    url = url.lower().removeprefix('https://').removeprefix('http://')
+    if url.startswith('www.'):
+        url = url[4:]
+    return url.rstrip('/')
+
+
+@lru_cache(maxsize=100_000)
+def domain_of(url: str) -> str:
+    """Domain part of a URL (no scheme, no www., no path)."""
+    return canonicalize_url(url).partition('/')[0]
+
+
+class PortalsStore:
+    """Mtime-keyed cache around portals.json with a single atomic flush."""
+
+    def __init__(self, path: Path = PORTALS_JSON):
+        self.path = path
+        self._mtime_ns = None
+        self._data = None
+        self.dirty = False
+
+    def load(self) -> dict:
+        """Return parsed portals data, reusing the cached parse when the
+        file on disk hasn't changed since the last load."""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            if self._data is None:
+                self._data = {"updated": "", "portals": [], "categories": []}
+            return self._data
+
+        if self._data is None or mtime_ns != self._mtime_ns:
+            with open(self.path, 'rb') as f:
+                self._data = loads_json(f.read())
+            self._mtime_ns = mtime_ns
+            self.dirty = False
+        return self._data
+
+    def mark_dirty(self):
+        """Record that the in-memory data diverged from disk."""
+        self.dirty = True
+
+    def flush(self):
+        """Write back to disk if anything changed, via temp + os.replace."""
+        if self._data is None or not self.dirty:
+            return
+        atomic_write_json(self.path, self._data)
+        self._mtime_ns = self.path.stat().st_mtime_ns
+        self.dirty = False
@@ -5,11 +5,22 @@ Adds relevance scores, trust levels, and status tracking.
 Now uses JSON files for exclusions instead of hardcoded lists.
 """
 
+import io
 import json
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# Optional streaming JSON parser - falls back to json.load if not installed
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from portals_store import PortalsStore, atomic_write_json
+
 # File paths
 PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
 EXCLUDED_JSON = Path(__file__).parent / "excluded_sites.json"
@@ -110,6 +121,85 @@ RED_FLAGS = [
     'hostinger dns system', 'future home of',
 ]
 
+# Frozen at import: keyword weights pre-scaled by 10 so the scoring
+# loop does no multiplication, and tuples iterate faster than
+# dict.items()/lists in the fallback paths
+_REL_ITEMS = tuple((k, w * 10) for k, w in RELEVANCE_KEYWORDS.items())
+_RED_FLAGS = tuple(RED_FLAGS)
+
+# Optional Aho-Corasick automatons - one scan over the text instead of
+# one substring search per keyword. Falls back to plain `in` loops.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _build_automaton(words):
+    auto = ahocorasick.Automaton()
+    for w in words:
+        auto.add_word(w, w)
+    auto.make_automaton()
+    return auto
+
+
+if ahocorasick is not None:
+    _RELEVANCE_AC = _build_automaton(RELEVANCE_KEYWORDS)
+    _RED_FLAG_AC = _build_automaton(RED_FLAGS)
+else:
+    _RELEVANCE_AC = None
+    _RED_FLAG_AC = None
+
+# Optional Hyperscan tier on top: a JIT-compiled DFA that scans with
+# SIMD at GB/s - negligible on short descriptions but what makes
+# full-page-body scoring viable. ahocorasick / plain loops remain the
+# fallbacks.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+def _build_hs_db(words):
+    db = hyperscan.Database()
+    db.compile(expressions=[re.escape(w).encode() for w in words],
+               ids=list(range(len(words))),
+               flags=[hyperscan.HS_FLAG_CASELESS] * len(words))
+    return db
+
+
+if hyperscan is not None:
+    _REL_WORDS = tuple(RELEVANCE_KEYWORDS)
+    _HS_RELEVANCE = _build_hs_db(_REL_WORDS)
+    _HS_RED_FLAGS = _build_hs_db(RED_FLAGS)
+else:
+    _HS_RELEVANCE = _HS_RED_FLAGS = None
+
+
+def _find_keywords(text: str) -> set:
+    """Return all relevance keywords present in text."""
+    if _HS_RELEVANCE is not None:
+        hits = set()
+        _HS_RELEVANCE.scan(text.encode('utf-8', 'replace'),
+                           match_event_handler=lambda pid, *_: hits.add(pid))
+        return {_REL_WORDS[i] for i in hits}
+    if _RELEVANCE_AC is not None:
+        return {kw for _, kw in _RELEVANCE_AC.iter(text)}
+    return {kw for kw in RELEVANCE_KEYWORDS if kw in text}
+
+
+def _has_red_flag(text: str) -> bool:
+    """True if any red flag phrase appears in text."""
+    if _HS_RED_FLAGS is not None:
+        hits = []
+        _HS_RED_FLAGS.scan(text.encode('utf-8', 'replace'),
+                           match_event_handler=lambda pid, *_: hits.append(pid))
+        return bool(hits)
+    if _RED_FLAG_AC is not None:
+        return next(_RED_FLAG_AC.iter(text), None) is not None
+    return any(flag in text for flag in _RED_FLAGS)
+
+
 # Quality categories
 TRUST_LEVELS = {
     'verified': 'Manually verified, trusted',
@@ -122,6 +212,41 @@ TRUST_LEVELS = {
 # Status values
 STATUS_VALUES = ['active', 'inactive', 'down', 'compromised', 'parked']
 
+# Trust ranking for threshold comparisons - dict lookup instead of a
+# list.index() per portal
+TRUST_IDX = {t: i for i, t in enumerate(['untrusted', 'low', 'medium', 'high', 'verified'])}
+
+
+@lru_cache(maxsize=4096)
+def get_domain(url: str) -> str:
+    """Domain part of a URL without the scheme or path.
+
+    removeprefix returns self on a miss and partition skips the list
+    allocation of split(), so this makes far fewer transient strings
+    than the old replace/replace/split chain - and it's cached since
+    several functions touch the same URLs in one pipeline run.
+    """
+    return url.removeprefix('https://').removeprefix('http://').partition('/')[0]
+
+
+def iter_portals():
+    """Stream portals one at a time without loading the whole file.
+
+    Uses ijson when available so peak memory stays O(one portal) instead
+    of O(whole file); falls back to json.load otherwise.
+    """
+    if ijson is not None:
+        with open(PORTALS_JSON, 'rb') as f:
+            yield from ijson.items(f, 'portals.item')
+    else:
+        with open(PORTALS_JSON) as f:
+            yield from json.load(f)['portals']
+
+
+def save_portals(data: dict):
+    """Write portals.json atomically."""
+    atomic_write_json(PORTALS_JSON, data)
+
 
 def load_excluded_domains() -> dict:
     """Load excluded domains from JSON file."""
@@ -147,8 +272,7 @@ def save_excluded_domains(excluded: dict):
         'excluded': excluded,
         'updated': datetime.now().strftime('%Y-%m-%d')
     }
-    with open(EXCLUDED_JSON, 'w') as f:
-        json.dump(data, f, indent=2)
+    atomic_write_json(EXCLUDED_JSON, data)
 
 
 def log_audit(action: str, site: str = None, reason: str = None, count: int = None):
@@ -172,8 +296,7 @@ def log_audit(action: str, site: str = None, reason: str = None, count: int = No
 
     data['log'].append(entry)
 
-    with open(AUDIT_LOG_JSON, 'w') as f:
-        json.dump(data, f, indent=2)
+    atomic_write_json(AUDIT_LOG_JSON, data)
 
 
 def exclude_site(domain: str, reason: str, category: str = 'other'):
@@ -236,19 +359,25 @@ def is_false_positive(domain: str, title: str, description: str) -> bool:
     return False
 
 
-def calculate_relevance(domain: str, title: str, description: str) -> tuple:
-    """Calculate relevance score 0-100 based on molt ecosystem keywords."""
+def score_one(domain: str, title: str, description: str, notes: str = "") -> tuple:
+    """Relevance score, keyword matches and trust level in one pass.
+
+    Builds the lowercased text and runs the false-positive check once;
+    calling calculate_relevance and calculate_trust separately used to
+    redo both (three lowercase/concat passes per portal).
+    """
     # First check if it's a false positive
     if is_false_positive(domain, title, description):
-        return (0, ['FALSE_POSITIVE'])
+        return (0, ['FALSE_POSITIVE'], 'untrusted')
 
     text = f"{domain} {title} {description}".lower()
     score = 0
     matches = []
 
-    for keyword, weight in RELEVANCE_KEYWORDS.items():
-        if keyword in text:
-            score += weight * 10
+    found = _find_keywords(text)
+    for keyword, scaled_weight in _REL_ITEMS:
+        if keyword in found:
+            score += scaled_weight
             matches.append(keyword)
 
     # Bonus for domain containing core molt/claw keywords (these are ecosystem sites)
@@ -275,66 +404,61 @@ def calculate_relevance(domain: str, title: str, description: str) -> tuple:
         score = max(0, score - (5 if is_molt_domain else 10))
 
     # Cap at 100
-    return (min(100, score), matches)
-
-
-def calculate_trust(domain: str, title: str, description: str, notes: str = "") -> str:
-    """Determine trust level based on content and flags."""
-    text = f"{domain} {title} {description} {notes}".lower()
-
-    # Check if it's a false positive - always untrusted
-    if is_false_positive(domain, title, description):
-        return 'untrusted'
+    relevance = min(100, score)
+
+    # Trust: red flags first, then relevance thresholds
+    trust_text = f"{text} {notes.lower()}" if notes else text
+    if _has_red_flag(trust_text):
+        trust = 'untrusted'
+    elif relevance >= 60:
+        trust = 'high'
+    elif relevance >= 30:
+        trust = 'medium'
+    else:
+        trust = 'low'
 
-    # Check for red flags
-    for flag in RED_FLAGS:
-        if flag in text:
-            return 'untrusted'
+    return (relevance, matches, trust)
 
-    # Check relevance
-    relevance, matches = calculate_relevance(domain, title, description)
 
-    # If marked as false positive
-    if 'FALSE_POSITIVE' in matches:
-        return 'untrusted'
+def calculate_relevance(domain: str, title: str, description: str) -> tuple:
+    """Calculate relevance score 0-100 based on molt ecosystem keywords."""
+    relevance, matches, _ = score_one(domain, title, description)
+    return (relevance, matches)
 
-    if relevance >= 60:
-        return 'high'
-    elif relevance >= 30:
-        return 'medium'
-    else:
-        return 'low'
 
+def calculate_trust(domain: str, title: str, description: str, notes: str = "") -> str:
+    """Determine trust level based on content and flags."""
+    return score_one(domain, title, description, notes)[2]
 
-def score_portals():
-    """Add quality scores to all portals."""
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
 
-    print("🔍 Scoring portals for quality...\n")
+def _score_portals_python(portals: list) -> tuple:
+    """Score portals one at a time in plain Python.
 
+    Returns (stats, false_positives, changed); mutates portal dicts in place.
+    """
     stats = {'high': 0, 'medium': 0, 'low': 0, 'untrusted': 0, 'verified': 0}
     false_positives = []
+    changed = 0
+    buf = io.StringIO()  # batch per-portal warnings into one write
 
-    for portal in data['portals']:
-        domain = portal.get('url', '').replace('https://', '').replace('http://', '').split('/')[0]
+    for portal in portals:
+        domain = get_domain(portal.get('url', ''))
         title = portal.get('name', '')
         description = portal.get('description', '')
         notes = portal.get('notes', '')
 
-        # Calculate scores
-        relevance, keywords = calculate_relevance(domain, title, description)
+        # Calculate scores and trust in one fused pass
+        relevance, keywords, trust = score_one(domain, title, description, notes)
 
         # Check if already has manual trust override
         if portal.get('verified'):
             trust = 'verified'
         elif 'FALSE_POSITIVE' in keywords:
-            trust = 'untrusted'
             false_positives.append(domain)
-        else:
-            trust = calculate_trust(domain, title, description, notes)
 
         # Update portal
+        if portal.get('relevance') != relevance or portal.get('trust') != trust:
+            changed += 1
         portal['relevance'] = relevance
         portal['trust'] = trust
 
@@ -343,11 +467,157 @@ def score_portals():
         # Show low quality for review
         if trust in ['low', 'untrusted']:
             reason = 'FALSE_POSITIVE' if 'FALSE_POSITIVE' in keywords else ''
-            print(f"  ⚠️  {domain}: trust={trust}, relevance={relevance} {reason}")
+            print(f"  ⚠️  {domain}: trust={trust}, relevance={relevance} {reason}", file=buf)
+
+    sys.stdout.write(buf.getvalue())
+    return stats, false_positives, changed
+
 
-    # Save
-    with open(PORTALS_JSON, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def _score_portals_vectorized(portals: list) -> tuple:
+    """Vectorized scoring pass using pandas column ops.
+
+    Same rules as the per-portal path (keyword weights, domain bonuses,
+    penalties, red flags, false positives) applied as masks over Series,
+    so the hot loops run in C instead of the interpreter.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame({
+        'url': [p.get('url', '') for p in portals],
+        'name': [p.get('name', '') for p in portals],
+        'description': [p.get('description', '') for p in portals],
+        'notes': [p.get('notes', '') for p in portals],
+        'verified': [bool(p.get('verified')) for p in portals],
+    })
+
+    domain = df.url.str.replace('https://', '', regex=False) \
+                   .str.replace('http://', '', regex=False).str.split('/').str[0]
+    domain_lower = domain.str.lower()
+    domain_clean = domain_lower.str.replace('www.', '', regex=False)
+    desc_lower = df.description.str.lower().str.strip()
+    text = (domain + ' ' + df.name + ' ' + df.description).str.lower()
+    bad_text = (df.name + ' ' + df.description).str.lower()
+
+    # False positives (mirrors is_false_positive / auto_detect_bad_site)
+    excluded = load_excluded_domains()
+    bad_re = '|'.join(re.escape(p) for pats in AUTO_DETECT_BAD.values() for p in pats)
+    fp = (
+        domain_clean.isin(excluded)
+        | domain_clean.str.startswith('mailto:')
+        | bad_text.str.contains(bad_re, regex=True)
+        | (desc_lower == domain_clean.str.strip())
+        | ((df.description.str.len() < 15)
+           & ~domain_clean.str.contains('molt', regex=False)
+           & ~domain_clean.str.contains('claw', regex=False))
+    )
+
+    # Keyword score
+    score = pd.Series(0, index=df.index)
+    for keyword, weight in RELEVANCE_KEYWORDS.items():
+        score += text.str.contains(keyword, regex=False) * (weight * 10)
+
+    # Domain bonuses
+    is_molt = domain_lower.str.contains('molt|claw|lobster|craber', regex=True)
+    score += is_molt * 30
+    score += (domain_lower.str.contains('agent', regex=False) & ~is_molt) * 10
+
+    # Penalties, each floored at 0 like the scalar path
+    generic = (df.description == ('Discovered at ' + domain)) | (df.description == domain)
+    score = (score - generic * is_molt.map({True: 10, False: 20})).clip(lower=0)
+    same_as_domain = desc_lower == domain_lower.str.strip()
+    score = (score - same_as_domain * is_molt.map({True: 15, False: 30})).clip(lower=0)
+    short = df.description.str.len() < 20
+    score = (score - short * is_molt.map({True: 5, False: 10})).clip(lower=0)
+    score = score.clip(upper=100)
+    score[fp] = 0
+
+    # Trust: thresholds, then red flags, then FP/verified overrides
+    trust_text = (domain + ' ' + df.name + ' ' + df.description + ' ' + df.notes).str.lower()
+    flag_re = '|'.join(re.escape(f) for f in RED_FLAGS)
+    trust = pd.Series('low', index=df.index)
+    trust[score >= 30] = 'medium'
+    trust[score >= 60] = 'high'
+    trust[trust_text.str.contains(flag_re, regex=True)] = 'untrusted'
+    trust[fp] = 'untrusted'
+    trust[df.verified] = 'verified'
+
+    # Scatter back to the dict list
+    stats = {'high': 0, 'medium': 0, 'low': 0, 'untrusted': 0, 'verified': 0}
+    false_positives = []
+    changed = 0
+    buf = io.StringIO()  # batch per-portal warnings into one write
+    for i, portal in enumerate(portals):
+        if portal.get('relevance') != int(score.iat[i]) or portal.get('trust') != trust.iat[i]:
+            changed += 1
+        portal['relevance'] = int(score.iat[i])
+        portal['trust'] = trust.iat[i]
+        stats[trust.iat[i]] = stats.get(trust.iat[i], 0) + 1
+        if fp.iat[i] and not df.verified.iat[i]:
+            false_positives.append(domain.iat[i])
+        if trust.iat[i] in ['low', 'untrusted']:
+            reason = 'FALSE_POSITIVE' if fp.iat[i] and not df.verified.iat[i] else ''
+            print(f"  ⚠️  {domain.iat[i]}: trust={trust.iat[i]}, relevance={int(score.iat[i])} {reason}", file=buf)
+
+    sys.stdout.write(buf.getvalue())
+    return stats, false_positives, changed
+
+
+def compute_quality_updates(portals: list) -> list:
+    """Compute (index, relevance, trust) updates without mutating.
+
+    Pure by design so the pipeline can run it in a worker thread
+    alongside read-only analyses; apply with apply_quality_updates.
+    """
+    updates = []
+    for i, portal in enumerate(portals):
+        domain = get_domain(portal.get('url', ''))
+        relevance, keywords, trust = score_one(
+            domain, portal.get('name', ''), portal.get('description', ''),
+            portal.get('notes', ''))
+        if portal.get('verified'):
+            trust = 'verified'
+        if portal.get('relevance') != relevance or portal.get('trust') != trust:
+            updates.append((i, relevance, trust))
+    return updates
+
+
+def apply_quality_updates(portals: list, updates: list) -> bool:
+    """Apply updates from compute_quality_updates; True if any applied."""
+    for i, relevance, trust in updates:
+        portals[i]['relevance'] = relevance
+        portals[i]['trust'] = trust
+    return bool(updates)
+
+
+def score_portals(store: PortalsStore = None):
+    """Add quality scores to all portals.
+
+    Pass a shared store to batch the write with other pipeline steps;
+    standalone calls load and flush their own.
+    """
+    own_store = store is None
+    if own_store:
+        store = PortalsStore(PORTALS_JSON)
+    data = store.load()
+
+    print("🔍 Scoring portals for quality...\n")
+
+    try:
+        import pandas  # noqa: F401 - vectorized fast path
+        scorer = _score_portals_vectorized
+    except ImportError:
+        scorer = _score_portals_python
+
+    stats, false_positives, changed = scorer(data['portals'])
+
+    # Save - but only if any score actually moved, so no-op runs
+    # don't rewrite (and re-diff) the whole file
+    if changed:
+        store.mark_dirty()
+        if own_store:
+            store.flush()
+    else:
+        print("  ✓ No score changes - skipping write")
 
     print(f"\n📊 Quality Distribution:")
     print(f"  ✅ Verified: {stats.get('verified', 0)}")
@@ -374,7 +644,7 @@ def cleanup_false_positives():
     # Filter out false positives
     cleaned_portals = []
     for portal in data['portals']:
-        domain = portal.get('url', '').replace('https://', '').replace('http://', '').split('/')[0].replace('www.', '')
+        domain = get_domain(portal.get('url', '')).removeprefix('www.')
         title = portal.get('name', '')
         description = portal.get('description', '')
 
@@ -385,9 +655,9 @@ def cleanup_false_positives():
 
     data['portals'] = cleaned_portals
 
-    # Save
-    with open(PORTALS_JSON, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Save only if something was actually removed
+    if removed:
+        save_portals(data)
 
     print(f"🧹 Cleanup complete:")
     print(f"   Removed: {len(removed)} false positives")
@@ -440,29 +710,22 @@ def needs_recheck():
 
 
 def filter_quality(min_trust: str = 'medium', min_relevance: int = 30):
-    """Get only quality portals meeting minimum thresholds."""
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
-
-    trust_order = ['untrusted', 'low', 'medium', 'high', 'verified']
-    min_trust_idx = trust_order.index(min_trust)
-
-    quality_portals = []
-    for portal in data['portals']:
-        trust = portal.get('trust', 'low')
-        relevance = portal.get('relevance', 0)
-        trust_idx = trust_order.index(trust) if trust in trust_order else 0
+    """Yield quality portals meeting minimum thresholds (streamed)."""
+    min_trust_idx = TRUST_IDX[min_trust]
 
-        if trust_idx >= min_trust_idx and relevance >= min_relevance:
-            quality_portals.append(portal)
+    for portal in iter_portals():
+        trust_idx = TRUST_IDX.get(portal.get('trust', 'low'), 0)
 
-    return quality_portals
+        if trust_idx >= min_trust_idx and portal.get('relevance', 0) >= min_relevance:
+            yield portal
 
 
-def mark_featured():
+def mark_featured(store: PortalsStore = None):
     """Automatically mark high-quality portals as featured."""
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
+    own_store = store is None
+    if own_store:
+        store = PortalsStore(PORTALS_JSON)
+    data = store.load()
 
     # Featured = verified OR (high trust AND relevance >= 60)
     featured_count = 0
@@ -473,29 +736,31 @@ def mark_featured():
                 featured_count += 1
                 print(f"  ⭐ Featured: {portal.get('name')}")
 
-    with open(PORTALS_JSON, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if featured_count:
+        store.mark_dirty()
+        if own_store:
+            store.flush()
 
     print(f"\n✅ Marked {featured_count} new portals as featured")
 
 
-def audit_low_quality():
+def audit_low_quality(store: PortalsStore = None):
     """Show all low/untrusted sites for manual review."""
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
-
-    low_quality = [p for p in data['portals'] if p.get('trust') in ['low', 'untrusted']]
+    portals = store.load()['portals'] if store is not None else iter_portals()
+    low_quality = [p for p in portals if p.get('trust') in ['low', 'untrusted']]
 
     print(f"🔍 AUDIT: {len(low_quality)} sites need review\n")
     print("-" * 60)
 
+    buf = io.StringIO()
     for p in sorted(low_quality, key=lambda x: x.get('relevance', 0)):
-        domain = p['url'].replace('https://', '').replace('http://', '').split('/')[0]
+        domain = get_domain(p['url'])
         trust = p.get('trust', 'unknown')
         relevance = p.get('relevance', 0)
-        print(f"{trust:10} | rel:{relevance:3} | {domain}")
-        print(f"           | {p.get('description', '')[:50]}")
-        print()
+        print(f"{trust:10} | rel:{relevance:3} | {domain}", file=buf)
+        print(f"           | {p.get('description', '')[:50]}", file=buf)
+        print(file=buf)
+    sys.stdout.write(buf.getvalue())
 
     print("-" * 60)
     print("To upgrade a site, edit portals.json and set:")
@@ -506,21 +771,18 @@ def show_stats():
     """Show overall statistics."""
     excluded = load_excluded_domains()
 
-    with open(PORTALS_JSON) as f:
-        data = json.load(f)
-
-    portals = data['portals']
-
-    print("📊 MOLT ECOSYSTEM STATS\n")
-    print(f"Total portals: {len(portals)}")
-    print(f"Excluded sites: {len(excluded)}")
-
-    # Trust distribution
+    # Trust distribution (single streamed pass)
+    total = 0
     by_trust = {}
-    for p in portals:
+    for p in iter_portals():
+        total += 1
         t = p.get('trust', 'unknown')
         by_trust[t] = by_trust.get(t, 0) + 1
 
+    print("📊 MOLT ECOSYSTEM STATS\n")
+    print(f"Total portals: {total}")
+    print(f"Excluded sites: {len(excluded)}")
+
     print(f"\nTrust Distribution:")
     for t in ['verified', 'high', 'medium', 'low', 'untrusted']:
         print(f"  {t:12}: {by_trust.get(t, 0)}")
@@ -537,12 +799,13 @@ def show_stats():
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) > 1:
         cmd = sys.argv[1]
         if cmd == '--featured':
-            score_portals()
-            mark_featured()
+            store = PortalsStore(PORTALS_JSON)
+            score_portals(store)
+            mark_featured(store)
+            store.flush()
         elif cmd == '--audit':
             audit_low_quality()
         elif cmd == '--cleanup':
@@ -4,10 +4,15 @@ Sync crawler discoveries to portals.json
 Merges new sites from molt_sites_db.json into the website's portals.json
 """
 
+import io
 import json
+import sys
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
+from portals_store import PortalsStore, canonicalize_url, domain_of
+
 # Paths
 CRAWLER_DB = Path(__file__).parent / "molt_sites_db.json"
 PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
@@ -42,6 +47,33 @@ CATEGORY_RULES = [
     (['ship', 'build', 'launch'], 'platform', 'Shipping', '🚀'),
 ]
 
+# Profile file: counts of how often each rule (keyed by tag) fired in
+# past syncs. On import, rules re-sort so the most common categories
+# are checked first; sync() rewrites the counters after each run, so
+# the ordering self-tunes. Delete the file to reset to source order.
+CATEGORY_HITS_JSON = Path(__file__).parent / "CATEGORY_HITS.json"
+
+
+def _load_category_hits() -> Counter:
+    try:
+        with open(CATEGORY_HITS_JSON) as f:
+            return Counter(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return Counter()
+
+
+_CATEGORY_HITS = _load_category_hits()
+
+# Stable sort: hot rules first, ties keep their source order. Note this
+# deliberately lets an observed-common rule win over an earlier source
+# rule when a site matches both - that's the point of the profile.
+CATEGORY_RULES.sort(key=lambda rule: -_CATEGORY_HITS[rule[2]])
+
+
+def _save_category_hits():
+    with open(CATEGORY_HITS_JSON, 'w') as f:
+        json.dump(dict(_CATEGORY_HITS), f, indent=2)
+
 # Default icon by category
 DEFAULT_ICONS = {
     'social': '💬',
@@ -60,22 +92,73 @@ MOLT_ICONS = {
 }
 
 
+# Optional Aho-Corasick automatons so detect_category scans the text
+# once instead of running ~60 substring checks per discovered site.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _build_category_automatons():
+    cat_auto = ahocorasick.Automaton()
+    for idx, (keywords, _, _, _) in enumerate(CATEGORY_RULES):
+        for k in keywords:
+            cat_auto.add_word(k, idx)
+    cat_auto.make_automaton()
+
+    molt_auto = ahocorasick.Automaton()
+    for idx, (keyword, icon) in enumerate(MOLT_ICONS.items()):
+        molt_auto.add_word(keyword, (idx, icon))
+    molt_auto.make_automaton()
+
+    return cat_auto, molt_auto
+
+
+if ahocorasick is not None:
+    _AC_CATEGORY, _AC_MOLT = _build_category_automatons()
+else:
+    _AC_CATEGORY = _AC_MOLT = None
+
+
 def detect_category(domain: str, title: str) -> tuple:
     """Detect category, tag, and icon from domain/title."""
     text = f"{domain} {title}".lower()
 
-    # Check molt-specific icons first
+    if _AC_CATEGORY is not None:
+        # min index preserves "first rule / first icon wins" ordering
+        rule_idx = min((idx for _, idx in _AC_CATEGORY.iter(text)), default=None)
+        molt_hit = min((val for _, val in _AC_MOLT.iter(domain.lower())), default=None)
+
+        if molt_hit is not None:
+            icon = molt_hit[1]
+            if rule_idx is not None:
+                _, category, tag, _ = CATEGORY_RULES[rule_idx]
+                _CATEGORY_HITS[tag] += 1
+                return category, tag, icon
+            return 'platform', 'Agent Platform', icon
+
+        if rule_idx is not None:
+            _, category, tag, icon = CATEGORY_RULES[rule_idx]
+            _CATEGORY_HITS[tag] += 1
+            return category, tag, icon
+
+        return 'platform', 'Platform', '🌐'
+
+    # Fallback: check molt-specific icons first
     for keyword, icon in MOLT_ICONS.items():
         if keyword in domain.lower():
             # Continue to find category
             for keywords, category, tag, _ in CATEGORY_RULES:
                 if any(k in text for k in keywords):
+                    _CATEGORY_HITS[tag] += 1
                     return category, tag, icon
             return 'platform', 'Agent Platform', icon
 
     # Check category rules
     for keywords, category, tag, icon in CATEGORY_RULES:
         if any(k in text for k in keywords):
+            _CATEGORY_HITS[tag] += 1
             return category, tag, icon
 
     # Default
@@ -122,25 +205,36 @@ def load_portals() -> dict:
         return json.load(f)
 
 
-def sync():
-    """Sync crawler discoveries to portals.json."""
+def sync(store: PortalsStore = None):
+    """Sync crawler discoveries to portals.json.
+
+    Pass a shared store to batch the write with other pipeline steps;
+    standalone calls load and flush their own.
+    """
     print("🔄 Syncing crawler discoveries to portals.json...")
 
     # Load data
+    own_store = store is None
+    if own_store:
+        store = PortalsStore(PORTALS_JSON)
     crawler_data = load_crawler_db()
-    portals_data = load_portals()
+    portals_data = store.load()
 
     if not crawler_data.get('sites'):
         print("No sites in crawler DB")
         return
 
-    # Get existing portal URLs
-    existing_urls = {p['url'].rstrip('/').lower() for p in portals_data.get('portals', [])}
-    existing_domains = {p['url'].split('//')[1].split('/')[0].lower() for p in portals_data.get('portals', [])}
+    # Get existing portal URL keys and domains in one pass
+    existing_keys = set()
+    existing_domains = set()
+    for p in portals_data.get('portals', []):
+        existing_keys.add(canonicalize_url(p['url']))
+        existing_domains.add(domain_of(p['url']))
 
     # Filter and convert new sites
     new_portals = []
     skipped_false_positives = []
+    buf = io.StringIO()  # batch per-site lines into one write
 
     for domain, info in crawler_data['sites'].items():
         # Skip if not alive or no content
@@ -151,11 +245,14 @@ def sync():
         url = info.get('url', f"https://{domain}").rstrip('/')
         domain_clean = domain.lower().replace('www.', '')
 
-        if url.lower() in existing_urls or domain_clean in existing_domains:
+        if canonicalize_url(url) in existing_keys or domain_clean in existing_domains:
             continue
 
-        # Skip subdomains of known sites (e.g., user.moltcities.org)
-        if any(domain_clean.endswith(f".{d}") for d in existing_domains):
+        # Skip subdomains of known sites (e.g., user.moltcities.org) -
+        # probe the candidate's own label suffixes against the domain set,
+        # O(labels) per candidate instead of O(known domains)
+        labels = domain_clean.split('.')
+        if any('.'.join(labels[i:]) in existing_domains for i in range(1, len(labels))):
             continue
 
         # Detect category
@@ -181,7 +278,12 @@ def sync():
         }
 
         new_portals.append(portal)
-        print(f"  + {domain}: {portal['name']} ({category})")
+        print(f"  + {domain}: {portal['name']} ({category})", file=buf)
+
+    sys.stdout.write(buf.getvalue())
+
+    # Persist rule-hit counters so the next import sorts hot rules first
+    _save_category_hits()
 
     if skipped_false_positives:
         print(f"\n⚠️  Skipped {len(skipped_false_positives)} false positives:")
@@ -209,24 +311,27 @@ def sync():
         ]
 
     # Save
-    with open(PORTALS_JSON, 'w') as f:
-        json.dump(portals_data, f, indent=2)
+    store.mark_dirty()
+    if own_store:
+        store.flush()
 
     print(f"\n✅ Added {len(new_portals)} new portals")
     print(f"📁 Total portals: {len(portals_data['portals'])}")
     print(f"💾 Saved to {PORTALS_JSON}")
 
 
-def run_quality_check():
+def run_quality_check(store: PortalsStore = None):
     """Run quality scoring after sync."""
     try:
         from quality import score_portals
         print("\n📊 Running quality check...")
-        score_portals()
+        score_portals(store)
     except ImportError:
         print("Quality module not found, skipping quality check")
 
 
 if __name__ == "__main__":
-    sync()
-    run_quality_check()
+    _store = PortalsStore(PORTALS_JSON)
+    sync(_store)
+    run_quality_check(_store)
+    _store.flush()
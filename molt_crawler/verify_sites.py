@@ -1,84 +1,617 @@
 #!/usr/bin/env python3
 """
-Site verification helper for molt ecosystem.
-Outputs unverified sites for Claude Code to verify using WebFetch.
+Site verification for the molt ecosystem.
+
+Lists unverified sites from the crawler DB, and can verify them with
+Claude: fetch each site, ask the model whether it's agent-usable, then
+apply the verdicts to portals.json / excluded_sites.json.
 
 Usage:
     python3 verify_sites.py              # List unverified sites
     python3 verify_sites.py --json       # Output as JSON for processing
     python3 verify_sites.py --limit N    # Limit to N sites
+    python3 verify_sites.py --verify     # Fetch + LLM-verify unverified sites
+    python3 verify_sites.py --url URL    # Verify one specific URL
+    python3 verify_sites.py --apply      # With --verify: write the verdicts
 
-Then in Claude Code, ask: "verify these sites" and it will use WebFetch + subagents.
+Requires ANTHROPIC_API_KEY for the --verify / --url paths.
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import re
+import ssl
 import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from urllib.parse import urlparse
-
-# File paths
-CRAWLER_DB = Path(__file__).parent / "molt_sites_db.json"
-PORTALS_JSON = Path(__file__).parent.parent / "portals.json"
-EXCLUDED_JSON = Path(__file__).parent / "excluded_sites.json"
-
-
-def load_excluded() -> set:
-    """Load excluded domains."""
-    if EXCLUDED_JSON.exists():
-        with open(EXCLUDED_JSON) as f:
-            data = json.load(f)
-            return set(data.get('excluded', {}).keys())
-    return set()
-
-
-def load_portals() -> set:
-    """Load existing portal domains."""
-    if PORTALS_JSON.exists():
-        with open(PORTALS_JSON) as f:
-            data = json.load(f)
-            domains = set()
-            for p in data.get('portals', []):
-                url = p.get('url', '')
-                domain = urlparse(url).netloc.replace('www.', '')
-                domains.add(domain)
-            return domains
-    return set()
-
-
-def get_unverified_sites(limit: int = 20) -> list:
-    """Get sites from crawler DB that aren't in portals or exclusions."""
-    if not CRAWLER_DB.exists():
-        return []
+from datetime import datetime, timedelta
 
-    with open(CRAWLER_DB) as f:
-        db = json.load(f)
+# aiohttp, certifi and anthropic are imported lazily in the fetch /
+# verify paths below - together they cost a few hundred ms of import
+# time that pure listing runs (--json, --limit, bare invocation) never
+# need to pay
 
-    sites = db.get('sites', {})
-    existing_portals = load_portals()
-    excluded = load_excluded()
+from _common import (CRAWLER_DB, PORTALS_JSON, EXCLUDED_JSON, _load_json,
+                     get_unverified_sites, load_excluded, load_portals,
+                     normalize_domain, normalize_url_key)
+from portals_store import atomic_write_json, dumps_json
+
+# Optional C HTML parser (lexbor engine) - roughly an order of magnitude
+# faster than the regex stripping below and much lower peak memory, since
+# the DOM is built in C. Falls back to the regex path.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# File paths (shared ones live in _common)
+VERIFY_CACHE_JSON = Path(__file__).parent / "verification_cache.json"
+
+# Re-verify a site only after this long, unless its content changed
+CACHE_TTL_DAYS = 30
+
+# Claude settings
+MODEL = "claude-3-5-haiku-latest"
+MAX_TOKENS = 500
+
+# Sites per batched verification call; each verdict needs ~120 tokens
+BATCH_SIZE = 5
+BATCH_TOKENS_PER_SITE = 120
 
-    unverified = []
-    for url, info in sites.items():
-        if not info.get('alive') or not info.get('has_real_content'):
-            continue
+# Read at most this much of a page - plenty for the title and first
+# paragraphs, and keeps multi-MB SPA bundles off the wire
+MAX_FETCH_BYTES = 262144
+FETCH_CHUNK = 16384
+
+# A declared body this big isn't a portal page - skip the read outright
+MAX_CONTENT_LENGTH = 10 * 1024 * 1024
 
-        domain = urlparse(url if url.startswith('http') else f'https://{url}').netloc.replace('www.', '')
+# One TLS context for the whole run - building it per request re-reads
+# the CA bundle every time. Built on first use (needs certifi).
+_ssl_ctx = None
 
-        # Skip if already processed
-        if domain in existing_portals or domain in excluded:
-            continue
 
-        unverified.append({
-            'url': info.get('url', f'https://{domain}'),
-            'domain': domain,
-            'title': info.get('title', '')
-        })
+def _get_ssl_ctx():
+    global _ssl_ctx
+    if _ssl_ctx is None:
+        import certifi
+        _ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+    return _ssl_ctx
+
+
+def make_session():
+    """Shared aiohttp session: keepalive pool, DNS cache, bounded timeouts."""
+    import aiohttp
+
+    # Only advertise brotli when a decoder is installed - advertising
+    # br without one makes aiohttp raise ContentEncodingError on every
+    # CDN that honours it
+    try:
+        import brotli  # noqa: F401
+        accept_encoding = 'gzip, deflate, br'
+    except ImportError:
+        accept_encoding = 'gzip, deflate'
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=32, limit_per_host=4, ttl_dns_cache=600,
+            enable_cleanup_closed=True, ssl=_get_ssl_ctx()),
+        timeout=aiohttp.ClientTimeout(total=15, connect=5),
+        headers={'User-Agent': 'molt-verifier/1.0',
+                 'Accept-Encoding': accept_encoding},
+    )
+
+
+VERIFY_PROMPT = """You are auditing a directory of websites that AI agents can actually use \
+(the "molt ecosystem": agent social networks, marketplaces, forums, tools).
+
+Site: {url}
+Title: {title}
+Page text (truncated):
+{content}
+
+Is this a real, working site that AI agents can use or participate in - \
+not a parked domain, not a site about AI for humans, not an unrelated business?
+
+Reply with JSON only:
+{{"agent_usable": true/false, "category": "social|creative|gaming|platform", \
+"description": "<one sentence>", "reason": "<short reason>"}}"""
+
+VERIFY_BATCH_PROMPT = """You are auditing a directory of websites that AI agents can actually use \
+(the "molt ecosystem": agent social networks, marketplaces, forums, tools).
+
+For each numbered site below: is it a real, working site that AI agents can use \
+or participate in - not a parked domain, not a site about AI for humans, not an \
+unrelated business?
+
+{sites_block}
+
+Reply with a JSON array only, one object per site, in the same order:
+[{{"agent_usable": true/false, "category": "social|creative|gaming|platform", \
+"description": "<one sentence>", "reason": "<short reason>"}}, ...]"""
+
+
+def load_cache() -> dict:
+    """Load the persistent verification cache."""
+    try:
+        data = _load_json(VERIFY_CACHE_JSON)
+    except json.JSONDecodeError:
+        data = None
+    return data if data is not None else {'entries': {}}
+
+
+def save_cache(cache: dict):
+    """Save the verification cache - atomic write, skipped entirely
+    when no verdict changed since load."""
+    try:
+        if dumps_json(cache) == VERIFY_CACHE_JSON.read_bytes():
+            return
+    except FileNotFoundError:
+        pass
+    cache['updated'] = datetime.now().strftime('%Y-%m-%d')
+    atomic_write_json(VERIFY_CACHE_JSON, cache)
+
+
+def cache_key(url: str, content: str) -> str:
+    """Cache key for one verification: same URL + same content = same verdict."""
+    return hashlib.sha256((url + content).encode('utf-8', 'replace')).hexdigest()
+
+
+def cache_lookup(cache: dict, key: str) -> dict:
+    """Return a cached verdict if present and still within the TTL."""
+    entry = cache.get('entries', {}).get(key)
+    if entry and entry.get('ts', 0) > time.time() - CACHE_TTL_DAYS * 86400:
+        return entry['verdict']
+    return None
+
+
+class TokenBucket:
+    """Pro-active RPM/TPM limiter for the Anthropic API.
+
+    Two buckets refilled continuously on a monotonic clock; acquire()
+    sleeps until a request slot and the estimated token budget are both
+    available, so the script stays under provider limits instead of
+    blind-retrying 429s. On a 429 the refill rates are halved.
+    """
+
+    def __init__(self, rpm: int = 50, tpm: int = 40_000):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_min = (now - self._last) / 60.0
+        self._last = now
+        self._requests = min(float(self.rpm), self._requests + elapsed_min * self.rpm)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed_min * self.tpm)
+
+    async def acquire(self, est_tokens: int):
+        """Block until one request + est_tokens fit under the limits."""
+        while True:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= est_tokens:
+                self._requests -= 1
+                self._tokens -= est_tokens
+                return
+            wait_r = (1 - self._requests) * 60.0 / self.rpm if self._requests < 1 else 0
+            wait_t = (est_tokens - self._tokens) * 60.0 / self.tpm if self._tokens < est_tokens else 0
+            await asyncio.sleep(max(wait_r, wait_t, 0.05))
+
+    def throttle(self):
+        """Halve refill rates after the provider said we're too fast."""
+        self.rpm = max(1, self.rpm // 2)
+        self.tpm = max(1000, self.tpm // 2)
+
+
+async def _create_with_backoff(client, bucket, **kwargs):
+    """messages.create with bucket pacing and backoff on RateLimitError.
+
+    Token cost is estimated as prompt chars / 4 plus the reply budget.
+    """
+    import anthropic
+
+    est_tokens = len(kwargs['messages'][0]['content']) // 4 + kwargs['max_tokens']
+    for attempt in range(4):
+        if bucket is not None:
+            await bucket.acquire(est_tokens)
+        try:
+            return await client.messages.create(**kwargs)
+        except anthropic.RateLimitError:
+            if attempt == 3:
+                raise
+            if bucket is not None:
+                bucket.throttle()
+            await asyncio.sleep(2 ** attempt)
+
+
+# Precompiled patterns for the regex fallback below. Script/style use
+# unrolled-loop patterns instead of DOTALL .*? so a malformed page
+# (e.g. an unclosed tag) can't trigger catastrophic backtracking.
+_TITLE_RE = re.compile(r'<title[^>]*>([^<]+)</title>', re.I)
+# Byte-level twins: run on the raw first 8KB so the title and the real
+# charset are known before (or instead of) decoding the whole body
+_TITLE_RE_BYTES = re.compile(rb'<title[^>]*>([^<]+)</title>', re.I)
+_CHARSET_RE_BYTES = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+_SCRIPT_RE = re.compile(r'<script\b[^>]*>[^<]*(?:<(?!/script>)[^<]*)*</script>', re.I)
+_STYLE_RE = re.compile(r'<style\b[^>]*>[^<]*(?:<(?!/style>)[^<]*)*</style>', re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Crustacean-themed domains get the lobster icon
+_MOLT_ICON_RE = re.compile(r'molt|claw|lob')
+
+
+def extract_title_and_text(html: str) -> tuple:
+    """Title and readable text from an HTML page."""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        title_node = tree.css_first('title')
+        title = title_node.text(strip=True)[:150] if title_node else ''
+        tree.strip_tags(['script', 'style', 'noscript', 'svg'])
+        text = tree.body.text(separator=' ', strip=True) if tree.body else ''
+        return title, text
+
+    # Regex fallback: strip scripts/styles/tags down to readable text
+    title = ''
+    title_match = _TITLE_RE.search(html)
+    if title_match:
+        title = title_match.group(1).strip()[:150]
+    text = _SCRIPT_RE.sub(' ', html)
+    text = _STYLE_RE.sub(' ', text)
+    text = _TAG_RE.sub(' ', text)
+    text = _WS_RE.sub(' ', text).strip()
+    return title, text
+
+
+async def fetch_site(session, url: str) -> dict:
+    """Fetch a site and extract title + readable text for the LLM."""
+    domain = normalize_domain(url)
+    result = {'url': url, 'domain': domain, 'status': 0, 'title': '',
+              'content': '', 'error': None, 'redirect': None}
+
+    try:
+        async with session.get(url, allow_redirects=True) as response:
+            result['status'] = response.status
+            final_domain = normalize_domain(str(response.url))
+            if final_domain != domain:
+                result['redirect'] = final_domain
+
+            # Status alone decides the verdict - don't read the body.
+            # (No HEAD preflight: for the live sites that matter it
+            # would just add a round-trip before the same GET.)
+            if response.status != 200:
+                return result
+
+            length = response.headers.get('Content-Length', '')
+            if length.isdigit() and int(length) > MAX_CONTENT_LENGTH:
+                result['error'] = 'too_large'
+                return result
+
+            # Stream and cap instead of response.text(): we truncate to
+            # 3000 chars anyway, so never buffer more than MAX_FETCH_BYTES
+            buf = bytearray()
+            async for chunk in response.content.iter_chunked(FETCH_CHUNK):
+                buf.extend(chunk)
+                if len(buf) >= MAX_FETCH_BYTES:
+                    break
+
+            # Title + charset from the raw prefix - most parked/redirect
+            # pages are decided on the title alone, and an explicit
+            # <meta charset> beats guessing before the full decode
+            head = bytes(buf[:8192])
+            title_match = _TITLE_RE_BYTES.search(head)
+            if title_match:
+                result['title'] = title_match.group(1).decode('utf-8', 'replace').strip()[:150]
+
+            if result['redirect'] is not None:
+                # Verdict already decided - skip the full decode/extract
+                return result
+
+            enc = response.charset
+            if not enc:
+                charset_match = _CHARSET_RE_BYTES.search(head)
+                enc = charset_match.group(1).decode('ascii', 'replace') if charset_match else 'utf-8'
+            try:
+                html = buf.decode(enc, errors='replace')
+            except LookupError:
+                html = buf.decode('utf-8', errors='replace')
+
+            title, text = extract_title_and_text(html)
+            if title:
+                result['title'] = title
+            result['content'] = text[:3000]
+    except Exception as e:
+        result['error'] = str(e)[:100]
+
+    return result
+
+
+def classify_fetch(site_data: dict):
+    """Verdict the fetch alone already decided, or None if the site
+    genuinely needs the LLM. Pure - no I/O."""
+    domain = site_data['domain']
+    if site_data.get('error'):
+        return {'domain': domain, 'agent_usable': False, 'category': None,
+                'description': '', 'reason': f"fetch failed: {site_data['error']}"}
+    if site_data.get('status') != 200:
+        return {'domain': domain, 'agent_usable': False, 'category': None,
+                'description': '', 'reason': f"HTTP {site_data['status']}"}
+    if site_data.get('redirect'):
+        return {'domain': domain, 'agent_usable': False, 'category': None,
+                'description': '', 'reason': f"redirects to {site_data['redirect']}"}
+    if len(site_data.get('content', '')) < 100:
+        return {'domain': domain, 'agent_usable': False, 'category': None,
+                'description': '', 'reason': 'minimal content'}
+    return None
+
+
+async def verify_with_llm(client, site_data: dict, bucket: TokenBucket = None) -> dict:
+    """Ask Claude whether a fetched site is agent-usable."""
+    domain = site_data['domain']
+
+    pre = classify_fetch(site_data)
+    if pre is not None:
+        return pre
+
+    prompt = VERIFY_PROMPT.format(url=site_data['url'],
+                                  title=site_data['title'],
+                                  content=site_data['content'][:2500])
+
+    message = await _create_with_backoff(
+        client, bucket,
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    text = message.content[0].text.strip()
+
+    try:
+        # Tolerate fences around the JSON
+        if text.startswith('```'):
+            text = text.split('```')[1].lstrip('json').strip()
+        verdict = json.loads(text)
+    except (json.JSONDecodeError, IndexError):
+        return {'domain': domain, 'agent_usable': False, 'category': None,
+                'description': '', 'reason': 'unparseable LLM response'}
+
+    verdict['domain'] = domain
+    return verdict
+
+
+async def verify_batch_with_llm(client, site_datas: list, batch_size: int = BATCH_SIZE,
+                                bucket: TokenBucket = None) -> dict:
+    """Verify several fetched sites per Claude call; returns {domain: verdict}.
+
+    The instruction prompt is a few hundred tokens - paying it once per
+    batch instead of once per site cuts prompt tokens near-linearly in
+    the batch size, plus one round-trip per batch. Any batch whose
+    response doesn't parse as a matching JSON array is retried through
+    the single-site path.
+    """
+    verdicts = {}
+
+    # Pre-decided fetches (errors, redirects, thin pages) never reach
+    # the model
+    to_ask = []
+    for sd in site_datas:
+        pre = classify_fetch(sd)
+        if pre is not None:
+            verdicts[pre['domain']] = pre
+        else:
+            to_ask.append(sd)
+
+    for start in range(0, len(to_ask), batch_size):
+        batch = to_ask[start:start + batch_size]
+        sites_block = '\n'.join(
+            f"{i}. {sd['url']}\nTitle: {sd['title']}\nText: {sd['content'][:600]}\n"
+            for i, sd in enumerate(batch, 1))
+        prompt = VERIFY_BATCH_PROMPT.format(sites_block=sites_block)
+
+        parsed = None
+        try:
+            message = await _create_with_backoff(
+                client, bucket,
+                model=MODEL,
+                max_tokens=BATCH_TOKENS_PER_SITE * len(batch),
+                messages=[{"role": "user", "content": prompt}],
+            )
+            text = message.content[0].text.strip()
+            if text.startswith('```'):
+                text = text.split('```')[1].lstrip('json').strip()
+            parsed = json.loads(text)
+        except (json.JSONDecodeError, IndexError):
+            parsed = None
+
+        if isinstance(parsed, list) and len(parsed) == len(batch):
+            for sd, verdict in zip(batch, parsed):
+                verdict['domain'] = sd['domain']
+                verdicts[sd['domain']] = verdict
+        else:
+            # Malformed batch reply: re-verify these sites one by one
+            for sd in batch:
+                v = await verify_with_llm(client, sd, bucket)
+                verdicts[v['domain']] = v
+
+    return verdicts
+
+
+async def verify_sites_concurrent(sites: list, concurrency: int = 8,
+                                  batch_size: int = BATCH_SIZE) -> dict:
+    """Verify many sites: bounded concurrent fetches, batched LLM calls.
+
+    Fetch wall-clock time scales with the concurrency cap instead of
+    the number of sites; verification then goes to Claude in batches
+    of `batch_size` so the instruction prompt is paid once per batch.
+    """
+    import anthropic
+
+    # Async client: LLM calls are awaited directly. Bounded timeout and
+    # retries so one slow call can't hang the whole batch.
+    client = anthropic.AsyncAnthropic(timeout=30.0, max_retries=3)
+    bucket = TokenBucket()
+    sem = asyncio.Semaphore(concurrency)
+    cache = load_cache()
+    results = {}
+    cache_hits = 0
+
+    # Pre-filter before any network I/O: sites already in portals or
+    # exclusions, or with a fresh cached verdict for the domain, never
+    # open a connection or spend tokens. (--url bypasses
+    # get_unverified_sites, so this is the only gate on that path.)
+    known = load_portals() | load_excluded()
+    cutoff = time.time() - CACHE_TTL_DAYS * 86400
+    recent = {e['verdict'].get('domain'): e['verdict']
+              for e in cache.get('entries', {}).values()
+              if e.get('ts', 0) > cutoff}
+
+    to_fetch = []
+    skipped_known = 0
+    for site in sites:
+        domain = site['domain']
+        if domain in known:
+            skipped_known += 1
+            continue
+        cached = recent.get(domain)
+        if cached is not None:
+            cache_hits += 1
+            print(f"  💨 {domain}: cached ({cached.get('reason', '')[:50]})")
+            results[domain] = cached
+            continue
+        to_fetch.append(site)
+
+    if skipped_known:
+        print(f"  ⏭️  {skipped_known} sites already in portals/exclusions")
+    sites = to_fetch
+
+    async def fetch_one(site):
+        async with sem:
+            site_data = await fetch_site(session, site['url'])
+        if not site_data.get('title') and site.get('title'):
+            site_data['title'] = site['title']
+        return site_data
+
+    fetched = []
+    if sites:
+        async with make_session() as session:
+            fetched = await asyncio.gather(*(fetch_one(site) for site in sites),
+                                           return_exceptions=True)
+
+    # Unchanged content within the TTL: reuse the prior verdict
+    to_verify = []
+    for site, site_data in zip(sites, fetched):
+        if isinstance(site_data, Exception):
+            print(f"  ⚠️  {site['domain']}: {site_data}")
+            continue
+        key = cache_key(site['url'], site_data.get('content', ''))
+        cached = cache_lookup(cache, key)
+        if cached is not None:
+            cache_hits += 1
+            print(f"  💨 {cached['domain']}: cached ({cached.get('reason', '')[:50]})")
+            results[cached['domain']] = cached
+            continue
+        to_verify.append((key, site_data))
+
+    verdicts = await verify_batch_with_llm(
+        client, [sd for _, sd in to_verify], batch_size, bucket)
+
+    for key, site_data in to_verify:
+        verdict = verdicts[site_data['domain']]
+        cache.setdefault('entries', {})[key] = {'verdict': verdict, 'ts': int(time.time())}
+        status = '✅' if verdict.get('agent_usable') else '❌'
+        print(f"  {status} {verdict['domain']}: {verdict.get('reason', '')[:60]}")
+        results[verdict['domain']] = verdict
+
+    save_cache(cache)
+    if cache_hits:
+        print(f"\n💨 {cache_hits} verdicts served from cache")
+
+    return results
+
+
+def apply_results(results: dict, apply: bool = False):
+    """Apply verification verdicts to portals.json and excluded_sites.json."""
+    # Memoized reads: load_portals below parses the same file, so a
+    # warm cache means one parse of each file for the whole call
+    portals_data = _load_json(PORTALS_JSON)
+    excluded_data = _load_json(EXCLUDED_JSON) or {'excluded': {}}
+
+    # Memoized domain set from the same file - no per-portal urlparse here
+    existing_domains = load_portals()
+    excluded = excluded_data.setdefault('excluded', {})
+
+    # One clock read for the whole batch, not one strftime per verdict
+    now = datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    recheck_after = (now + timedelta(days=180)).strftime('%Y-%m-%d')
+
+    # Collect changes first; the (possibly cached) parses are only
+    # mutated on an actual --apply run
+    new_portals, new_exclusions = [], {}
+    for domain, verdict in results.items():
+        if verdict.get('agent_usable'):
+            if domain in existing_domains:
+                continue
+            icon = '🦞' if _MOLT_ICON_RE.search(domain) else '🤖'
+            new_portals.append({
+                'id': domain.replace('.', '-').lower(),
+                'name': verdict.get('description', '').split('.')[0][:50] or domain,
+                'url': f"https://{domain}",
+                'icon': icon,
+                'category': verdict.get('category') or 'platform',
+                'tag': 'Verified',
+                'description': verdict.get('description', '')[:150],
+                'discovered': today,
+            })
+        else:
+            if domain not in excluded:
+                new_exclusions[domain] = {
+                    'reason': verdict.get('reason', 'failed verification'),
+                    'category': 'llm_rejected',
+                    'checked': today,
+                    'recheck_after': recheck_after,
+                }
+
+    print(f"\n📊 Verdicts: {len(new_portals)} agent-usable, {len(new_exclusions)} rejected")
+
+    if not apply:
+        print("   (dry run - pass --apply to write)")
+        return
 
-        if len(unverified) >= limit:
-            break
+    # Only rewrite the files the verdicts actually touched; the two
+    # files are independent, so the writes overlap in threads
+    writes = []
+    if new_portals:
+        portals_data['portals'].extend(new_portals)
+        portals_data['updated'] = today
+        writes.append((PORTALS_JSON, portals_data))
+    if new_exclusions:
+        excluded.update(new_exclusions)
+        excluded_data['updated'] = today
+        writes.append((EXCLUDED_JSON, excluded_data))
+
+    if writes:
+        with ThreadPoolExecutor(max_workers=len(writes)) as pool:
+            list(pool.map(lambda w: atomic_write_json(*w), writes))
+
+    print(f"💾 Wrote {len(new_portals)} portals, {len(new_exclusions)} exclusions")
+
+
+def run_verification(sites: list, apply: bool = False):
+    """Fetch + LLM-verify the given sites and apply the verdicts."""
+    if not os.environ.get('ANTHROPIC_API_KEY'):
+        print("⚠️  ANTHROPIC_API_KEY not set - cannot verify")
+        return
 
-    return unverified
+    print(f"🔍 Verifying {len(sites)} sites...\n")
+    results = asyncio.run(verify_sites_concurrent(sites))
+    apply_results(results, apply=apply)
 
 
 def check_duplicates() -> list:
@@ -89,38 +622,35 @@ def check_duplicates() -> list:
     with open(PORTALS_JSON) as f:
         data = json.load(f)
 
-    url_to_portals = {}
+    url_to_portals = defaultdict(list)
     for p in data['portals']:
-        url = p.get('url', '')
-        normalized = urlparse(url.lower())
-        domain = normalized.netloc.replace('www.', '')
-        key = f"{domain}{normalized.path.rstrip('/')}"
-
-        if key not in url_to_portals:
-            url_to_portals[key] = []
-        url_to_portals[key].append(p)
-
-    duplicates = []
-    for key, portals in url_to_portals.items():
-        if len(portals) > 1:
-            duplicates.append({
-                'key': key,
-                'count': len(portals),
-                'ids': [p['id'] for p in portals]
-            })
+        url_to_portals[normalize_url_key(p.get('url', ''))].append(p)
 
-    return duplicates
+    return [{'key': key, 'count': len(portals), 'ids': [p['id'] for p in portals]}
+            for key, portals in url_to_portals.items() if len(portals) > 1]
 
 
 def main():
     args = sys.argv[1:]
 
     as_json = '--json' in args
+    apply = '--apply' in args
     limit = 20
+    urls = []
 
     for i, arg in enumerate(args):
         if arg == '--limit' and i + 1 < len(args):
             limit = int(args[i + 1])
+        if arg == '--url' and i + 1 < len(args):
+            urls.append(args[i + 1])
+
+    # Verify specific URLs
+    if urls:
+        sites = [{'url': u if u.startswith('http') else f'https://{u}',
+                  'domain': normalize_domain(u),
+                  'title': ''} for u in urls]
+        run_verification(sites, apply=apply)
+        return
 
     # Check for duplicates first
     duplicates = check_duplicates()
@@ -131,6 +661,13 @@ def main():
     # Get unverified sites
     sites = get_unverified_sites(limit)
 
+    if '--verify' in args:
+        if not sites:
+            print("✅ No unverified sites found")
+            return
+        run_verification(sites, apply=apply)
+        return
+
     if as_json:
         print(json.dumps({
             'unverified': sites,